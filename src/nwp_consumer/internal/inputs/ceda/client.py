@@ -2,6 +2,7 @@
 
 import datetime as dt
 import pathlib
+import shutil
 import typing
 import urllib.parse
 import urllib.request
@@ -9,7 +10,9 @@ import urllib.request
 import cfgrib
 import numpy as np
 import requests
+import requests.adapters
 import structlog
+import urllib3.util
 import xarray as xr
 
 from nwp_consumer import internal
@@ -19,7 +22,7 @@ from ._models import CEDAFileInfo, CEDAResponse
 log = structlog.getLogger()
 
 # Defines parameters in CEDA that are not available from MetOffice
-PARAMETER_IGNORE_LIST: typing.Sequence[str] = (
+PARAMETER_IGNORE_LIST: frozenset[str] = frozenset({
     "unknown",
     "h",
     "hcct",
@@ -27,9 +30,34 @@ PARAMETER_IGNORE_LIST: typing.Sequence[str] = (
     "dpt",
     "prmsl",
     "cbh",
+})
+
+COORDINATE_ALLOW_LIST: frozenset[str] = frozenset({"time", "step", "x", "y"})
+
+# Size in bytes of each read from the FTP stream when downloading a file
+DOWNLOAD_CHUNK_SIZE: int = 1024 * 1024
+
+# Pooled HTTPS session for the CEDA JSON API
+# * Listing many init times reuses connections instead of reconnecting per request
+# * Transient gateway errors are retried with a backoff rather than failing the listing
+# * Raw files are still fetched over FTP, as the HTTPS archive requires token auth
+_session: requests.Session = requests.Session()
+_session.mount(
+    prefix="https://",
+    adapter=requests.adapters.HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=8,
+        max_retries=urllib3.util.Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[502, 503, 504],
+            raise_on_status=False,
+        ),
+    ),
 )
 
-COORDINATE_ALLOW_LIST: typing.Sequence[str] = ("time", "step", "x", "y")
+# Schema for the CEDA JSON API response, built once as it is reused for every listing
+_responseSchema = CEDAResponse.Schema()
 
 # Defines the mapping from CEDA parameter names to OCF parameter names
 
@@ -74,10 +102,19 @@ class Client(internal.FetcherInterface):
 
         # Fetch info for all files available on the input date
         # * CEDA has a HTTPS JSON API for this purpose
-        response: requests.Response = requests.request(
-            method="GET",
-            url=f"https://data.ceda.ac.uk/badc/ukmo-nwp/data/ukv-grib/{it:%Y/%m/%d}?json",
-        )
+        try:
+            response: requests.Response = _session.request(
+                method="GET",
+                url=f"https://data.ceda.ac.uk/badc/ukmo-nwp/data/ukv-grib/{it:%Y/%m/%d}?json",
+                timeout=(5, 30),
+            )
+        except requests.RequestException as e:
+            log.warn(
+                event="error calling filelist endpoint",
+                init_time=f"{it:%Y/%m/%d %H:%M}",
+                error=e,
+            )
+            return []
 
         if response.status_code == 404:
             # No data available for this init time. Fail soft
@@ -98,12 +135,13 @@ class Client(internal.FetcherInterface):
 
         # Map the response to a CEDAResponse object to ensure it looks as expected
         try:
-            responseObj: CEDAResponse = CEDAResponse.Schema().load(response.json())
+            responseData: dict = response.json()
+            responseObj: CEDAResponse = _responseSchema.load(responseData)
         except Exception as e:
             log.warn(
                 event="response from ceda does not match expected schema",
                 error=e,
-                response=response.json(),
+                response=response.text,
             )
             return []
 
@@ -136,11 +174,11 @@ class Client(internal.FetcherInterface):
             return pathlib.Path()
 
         # Stream the filedata into a cached file
+        # * Large reads keep the number of syscalls per file low;
+        #   the file is flushed once on closing rather than per chunk
         cfp: pathlib.Path = internal.rawCachePath(it=fi.it(), filename=fi.filename())
         with cfp.open("wb") as f:
-            for chunk in iter(lambda: response.read(16 * 1024), b""):
-                f.write(chunk)
-                f.flush()
+            shutil.copyfileobj(response, f, length=DOWNLOAD_CHUNK_SIZE)
 
         log.debug(
             event="fetched all data from file",
@@ -170,11 +208,12 @@ class Client(internal.FetcherInterface):
 
         # Load the wholesale file as a list of datasets
         # * cfgrib loads multiple hypercubes for a single multi-parameter grib file
-        # * Can also set backend_kwargs={"indexpath": ""}, to avoid the index file
+        # * The file is only opened once, so writing an index file alongside it is wasted work
         try:
             datasets: list[xr.Dataset] = cfgrib.open_datasets(
                 path=p.as_posix(),
                 chunks={"time": 1, "step": -1, "variable": -1, "x": "auto", "y": "auto"},
+                backend_kwargs={"indexpath": ""},
             )
         except Exception as e:
             log.warn(event="error converting raw file to dataset", filepath=p.as_posix(), error=e)
@@ -195,14 +234,10 @@ class Client(internal.FetcherInterface):
             if "sde" in ds:
                 ds = ds.assign(sde=ds["sde"] * 1000)
 
-            # Delete unnecessary data variables
-            for var_name in PARAMETER_IGNORE_LIST:
-                if var_name in ds:
-                    del ds[var_name]
-
-            # Delete unwanted coordinates
+            # Delete unnecessary data variables and unwanted coordinates in one go
             ds = ds.drop_vars(
-                names=[c for c in ds.coords if c not in COORDINATE_ALLOW_LIST],
+                names=[v for v in ds.data_vars if v in PARAMETER_IGNORE_LIST]
+                + [c for c in ds.coords if c not in COORDINATE_ALLOW_LIST],
                 errors="ignore",
             )
 
@@ -210,11 +245,24 @@ class Client(internal.FetcherInterface):
             datasets[i] = ds
 
         # Merge the datasets back into one
-        wholesaleDataset = xr.merge(
-            objects=datasets,
-            compat="override",
-            combine_attrs="drop_conflicts",
-        )
+        # * Skip hypercubes left without data variables, as their coordinates may differ
+        # * The remaining hypercubes normally share their coordinates, so try an exact
+        #   join first to avoid realigning every variable; fall back to aligning if not
+        datasets = [ds for ds in datasets if len(ds.data_vars) > 0]
+        try:
+            wholesaleDataset = xr.merge(
+                objects=datasets,
+                compat="override",
+                join="exact",
+                combine_attrs="drop_conflicts",
+            )
+        except ValueError:
+            log.debug(event="aligning hypercubes with differing coordinates", filepath=p.as_posix())
+            wholesaleDataset = xr.merge(
+                objects=datasets,
+                compat="override",
+                combine_attrs="drop_conflicts",
+            )
 
         del datasets
 
@@ -225,6 +273,11 @@ class Client(internal.FetcherInterface):
             log.warn(event="error reshaping to 2D grid", filepath=p.as_posix(), error=e)
             return xr.Dataset()
 
+        # Sort by step, unless cfgrib has already returned the steps in order
+        # * Sorting reindexes every variable, so is skipped when it would be a no-op
+        if not wholesaleDataset.get_index("step").is_monotonic_increasing:
+            wholesaleDataset = wholesaleDataset.sortby("step")
+
         # Map the data to the internal dataset representation
         # * Transpose the Dataset so that the dimensions are correctly ordered
         # * Rechunk the data to a more optimal size
@@ -232,13 +285,12 @@ class Client(internal.FetcherInterface):
             wholesaleDataset.rename({"time": "init_time"})
             .expand_dims("init_time")
             .transpose("init_time", "step", "y", "x")
-            .sortby("step")
             .chunk(
                 {
                     "init_time": 1,
                     "step": -1,
-                    "y": len(wholesaleDataset.y) // 2,
-                    "x": len(wholesaleDataset.x) // 2,
+                    "y": wholesaleDataset.sizes["y"] // 2,
+                    "x": wholesaleDataset.sizes["x"] // 2,
                 },
             )
         )
@@ -285,7 +337,8 @@ def _reshapeTo2DGrid(*, ds: xr.Dataset) -> xr.Dataset:
     The ordering of the pixels in the grib are left to right, bottom to top.
 
     This function replaces the `values` dimension with an `x` and `y` dimension,
-    and, for each step, reshapes the images to be 2D.
+    and, for each step, reshapes the images to be 2D. Coordinates defined along
+    the `values` dimension are reshaped in the same way.
 
     :param ds: The dataset to reshape
     """
@@ -308,18 +361,24 @@ def _reshapeTo2DGrid(*, ds: xr.Dataset) -> xr.Dataset:
             f"but expected {len(northing) * len(easting)}",
         )
 
-    # Create new coordinates,
-    # which give the `x` and `y` position for each position in the `values` dimension:
-    ds = ds.assign_coords(
-        {
-            "x": ("values", np.tile(easting, reps=len(northing))),
-            "y": ("values", np.repeat(northing, repeats=len(easting))),
-        },
-    )
-
-    # Now set `values` to be a MultiIndex, indexed by `y` and `x`:
-    ds = ds.set_index(values=("y", "x"))
+    # Reshape the `values` dimension of each variable into `y` and `x`.
+    # * The flat array runs along each row of eastings in turn, starting from the
+    #   first northing, so a plain reshape gives a (northing, easting) image.
+    # * The `y` axis is then reversed so that the northings are ascending.
+    reshaped: dict[typing.Hashable, tuple] = {}
+    for name, var in ds.variables.items():
+        if name == "values" or "values" not in var.dims:
+            continue
+        var = var.transpose(..., "values")
+        reshaped[name] = (
+            (*var.dims[:-1], "y", "x"),
+            var.data.reshape(*var.shape[:-1], len(northing), len(easting))[..., ::-1, :],
+            var.attrs,
+        )
 
-    # Now unstack. This gets rid of the `values` dimension and indexes
-    # the data variables using `y` and `x`.
-    return ds.unstack("values")
+    return (
+        ds.drop_vars(names="values", errors="ignore")
+        .assign_coords({k: v for k, v in reshaped.items() if k in ds.coords})
+        .assign({k: v for k, v in reshaped.items() if k in ds.data_vars})
+        .assign_coords({"y": northing[::-1], "x": easting})
+    )
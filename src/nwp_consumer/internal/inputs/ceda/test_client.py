@@ -100,23 +100,47 @@ class TestIsWantedFile(unittest.TestCase):
 class TestReshapeTo2DGrid(unittest.TestCase):
 
     def test_correctlyReshapesData(self) -> None:
+        values = np.random.rand(4, 385792)
         dataset = xr.Dataset(
             data_vars={
-                "wdir10": (("step", "values"), np.random.rand(4, 385792)),
+                "wdir10": (("step", "values"), values),
             },
             coords={
                 "step": [0, 1, 2, 3],
+                "latitude": ("values", np.arange(385792)),
             },
         )
 
         reshapedDataset = _reshapeTo2DGrid(ds=dataset)
 
-        self.assertEqual(548, reshapedDataset.dims["x"])
-        self.assertEqual(704, reshapedDataset.dims["y"])
+        self.assertEqual(548, reshapedDataset.sizes["x"])
+        self.assertEqual(704, reshapedDataset.sizes["y"])
 
         with self.assertRaises(KeyError):
             _ = reshapedDataset["values"]
 
+        # Ensure the y coordinate is ascending and the x coordinate is ascending
+        self.assertEqual(-183000, reshapedDataset.y.values[0])
+        self.assertEqual(1223000, reshapedDataset.y.values[-1])
+        self.assertEqual(-239000, reshapedDataset.x.values[0])
+        self.assertEqual(855000, reshapedDataset.x.values[-1])
+
+        # Ensure the flat values run along each row of eastings from the top northing
+        for flatIndex, y, x in [
+            (0, 1223000, -239000),
+            (1, 1223000, -237000),
+            (548, 1221000, -239000),
+            (385791, -183000, 855000),
+        ]:
+            self.assertEqual(
+                values[2, flatIndex],
+                reshapedDataset["wdir10"].sel(step=2, y=y, x=x).values,
+            )
+            self.assertEqual(flatIndex, reshapedDataset["latitude"].sel(y=y, x=x).values)
+
+        # Ensure coordinates along the values dimension are reshaped too
+        self.assertEqual(("y", "x"), reshapedDataset["latitude"].dims)
+
     def test_raisesErrorForIncorrectNumberOfValues(self) -> None:
         ds1 = xr.Dataset(
             data_vars={
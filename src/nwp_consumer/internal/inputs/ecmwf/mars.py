@@ -3,7 +3,7 @@ import datetime as dt
 import inspect
 import os
 import pathlib
-import re
+import string
 import tempfile
 import typing
 
@@ -50,7 +50,7 @@ AREA_MAP: dict[str, str] = {
     "global": "G",
 }
 
-COORDINATE_ALLOW_LIST: typing.Sequence[str] = ("time", "step", "latitude", "longitude")
+COORDINATE_ALLOW_LIST: frozenset[str] = frozenset({"time", "step", "latitude", "longitude"})
 
 
 def marsLogger(msg: str) -> None:
@@ -75,6 +75,23 @@ class MARSClient(internal.FetcherInterface):
     area: str
     desired_params: list[str]
 
+    # Template for the body of a MARS request, dedented once at class creation
+    _REQ_TMPL: string.Template = string.Template(inspect.cleandoc("""
+        $verb,
+            class    = od,
+            date     = $date,
+            expver   = 1,
+            levtype  = sfc,
+            param    = $param,
+            step     = 0/to/$hours/by/1,
+            stream   = oper,
+            time     = $time,
+            type     = fc,
+            area     = $area,
+            grid     = 0.1/0.1,
+            target   = "$target"
+    """))
+
     def __init__(
             self,
             area: str = "uk",
@@ -131,9 +148,10 @@ class MARSClient(internal.FetcherInterface):
             )
             return []
 
-        tf = tempfile.NamedTemporaryFile(suffix=".txt", delete=False)
-
-        with open(tf.name, "w") as f:
+        # Write the listing to a temporary file which is deleted on closing
+        # * MARS writes the listing to the file by path, in place, so it can be
+        #   read back through the same handle without reopening the file
+        with tempfile.NamedTemporaryFile(mode="r", suffix=".txt") as tf:
             req: str = self._buildMarsRequest(
                 list_only=True,
                 it=it,
@@ -149,26 +167,25 @@ class MARSClient(internal.FetcherInterface):
                 log.warn("error listing ECMWF MARS inittime data", error=e)
                 return []
 
-        # Explicitly check that the MARS listing file is readable and non-empty
-        if (os.access(tf.name, os.R_OK) is False) or (os.stat(tf.name).st_size < 100):
-            log.warn(
-                event="ECMWF filelisting is empty, check error logs",
-                filepath=tf.name,
-            )
-            return []
+            # Explicitly check that the MARS listing file is non-empty
+            if os.fstat(tf.fileno()).st_size < 100:
+                log.warn(
+                    event="ECMWF filelisting is empty, check error logs",
+                    filepath=tf.name,
+                )
+                return []
+
+            available_params: list[str] = _parseAvaliableParams(fileData=tf)
 
         # Ensure only available parameters are requested by populating the
         # `available_params` list according to the result of the list request
-        with open(tf.name) as f:
-            file_contents: str = f.read()
-            available_params: list[str] = _parseAvaliableParams(fileData=file_contents)
-            for parameter in self.desired_params:
-                if parameter not in available_params:
-                    log.warn(
-                        event=f"ECMWF MARS inittime data does not contain parameter {parameter}",
-                        parameter=parameter,
-                        inittime=it,
-                    )
+        for parameter in self.desired_params:
+            if parameter not in available_params:
+                log.warn(
+                    event=f"ECMWF MARS inittime data does not contain parameter {parameter}",
+                    parameter=parameter,
+                    inittime=it,
+                )
 
         log.debug(
             event="Listed raw files for ECMWF MARS inittime",
@@ -176,10 +193,6 @@ class MARSClient(internal.FetcherInterface):
             available_params=available_params,
         )
 
-        # Clean up the temporary file
-        tf.close()
-        os.unlink(tf.name)
-
         return [ECMWFMarsFileInfo(inittime=it, area=self.area, params=available_params)]
 
     def downloadToCache(  # noqa: D102
@@ -249,13 +262,29 @@ class MARSClient(internal.FetcherInterface):
             return xr.Dataset()
 
         # Merge the datasets back into one
-        wholesaleDataset = xr.merge(
-            objects=datasets,
-            compat="override",
-            combine_attrs="drop_conflicts",
-        )
+        # * The hypercubes normally share their coordinates, so try an exact join
+        #   first to avoid realigning every variable; fall back to aligning if not
+        try:
+            wholesaleDataset = xr.merge(
+                objects=datasets,
+                compat="override",
+                join="exact",
+                combine_attrs="drop_conflicts",
+            )
+        except ValueError:
+            log.debug(event="aligning hypercubes with differing coordinates", filepath=p.as_posix())
+            wholesaleDataset = xr.merge(
+                objects=datasets,
+                compat="override",
+                combine_attrs="drop_conflicts",
+            )
         del datasets
 
+        # Sort by step, unless cfgrib has already returned the steps in order
+        # * Sorting reindexes every variable, so is skipped when it would be a no-op
+        if not wholesaleDataset.get_index("step").is_monotonic_increasing:
+            wholesaleDataset = wholesaleDataset.sortby("step")
+
         # Map the data to the internal dataset representation
         # * Transpose the Dataset so that the dimensions are correctly ordered
         # * Rechunk the data to a more optimal size
@@ -263,13 +292,12 @@ class MARSClient(internal.FetcherInterface):
             wholesaleDataset.rename({"time": "init_time"})
             .expand_dims("init_time")
             .transpose("init_time", "step", "latitude", "longitude")
-            .sortby("step")
             .chunk(
                 {
                     "init_time": 1,
                     "step": -1,
-                    "latitude": len(wholesaleDataset.latitude) // 2,
-                    "longitude": len(wholesaleDataset.longitude) // 2,
+                    "latitude": wholesaleDataset.sizes["latitude"] // 2,
+                    "longitude": wholesaleDataset.sizes["longitude"] // 2,
                 },
             )
         )
@@ -321,26 +349,18 @@ class MARSClient(internal.FetcherInterface):
         Returns:
             The MARS request.
         """
-        marsReq: str = f"""
-            {"list" if list_only else "retrieve"},
-                class    = od,
-                date     = {it.strftime("%Y%m%d")},
-                expver   = 1,
-                levtype  = sfc,
-                param    = {'/'.join(params)},
-                step     = 0/to/{self.hours}/by/1,
-                stream   = oper,
-                time     = {it.strftime("%H")},
-                type     = fc,
-                area     = {AREA_MAP[self.area]},
-                grid     = 0.1/0.1,
-                target   = "{target}"
-        """
-
-        return inspect.cleandoc(marsReq)
+        return self._REQ_TMPL.substitute(
+            verb="list" if list_only else "retrieve",
+            date=f"{it.year:04d}{it.month:02d}{it.day:02d}",
+            param="/".join(params),
+            hours=self.hours,
+            time=f"{it.hour:02d}",
+            area=AREA_MAP[self.area],
+            target=target,
+        )
 
 
-def _parseAvaliableParams(fileData: str) -> list[str]:
+def _parseAvaliableParams(fileData: str | typing.Iterable[str]) -> list[str]:
     """Parse the response from a MARS list request.
 
     When calling LIST to MARS, the response is a file containing the available
@@ -360,21 +380,29 @@ def _parseAvaliableParams(fileData: str) -> list[str]:
     Grand Total
     ```
 
-    This function uses positive lookahead and lookbehind regex to extract the
-    lines between the table header and the "Grand Total" line. The fourth
-    column of each line is the parameter.
+    This function scans the lines once, collecting the value in the `param`
+    column of each line between the table header and the "Grand Total" line.
 
     Args:
-        fileData: The data from the file.
+        fileData: The data from the file, or an iterable over its lines.
 
     Returns:
-        A list of parameters specified in the fileData.
+        A sorted list of parameters specified in the fileData.
     """
-    tablematch = re.search(
-        pattern=r"(?<!step)[\s\.\d]*?(?=\n.*?\nGrand)",
-        string=fileData,
-    )
-    if tablematch:
-        tablelines: list[str] = tablematch.group(0).split("\n")
-        return list({line.split()[4] for line in tablelines if len(line.split()) > 4})
-    return []
+    if isinstance(fileData, str):
+        fileData = fileData.splitlines()
+
+    params: set[str] = set()
+    paramColumn: int | None = None
+    for line in fileData:
+        parts: list[str] = line.split()
+        if paramColumn is None:
+            # Look for the table header
+            if parts[:1] == ["file"] and "param" in parts:
+                paramColumn = parts.index("param")
+        elif line.startswith("Grand"):
+            break
+        elif len(parts) > paramColumn:
+            params.add(parts[paramColumn])
+
+    return sorted(params)
@@ -55,6 +55,41 @@ class TestECMWFMARSClient(unittest.TestCase):
         with self.assertRaises(KeyError):
             _ = MARSClient(area="uk", hours=100)
 
+    def test_listRawFilesForInitTime(self) -> None:
+        testBasicClient = MARSClient(area="uk", hours=4, param_group="basic")
+        targets: list[str] = []
+
+        def _writeListing(target: str, **_: str) -> None:
+            targets.append(target)
+            with open(target, "w") as f:
+                f.write(test_list_response)
+
+        def _writeNothing(target: str, **_: str) -> None:
+            targets.append(target)
+
+        with unittest.mock.patch.object(
+            testBasicClient.server, "execute", side_effect=_writeListing,
+        ):
+            out = testBasicClient.listRawFilesForInitTime(
+                it=dt.datetime(2020, 1, 1, tzinfo=dt.UTC),
+            )
+
+        self.assertEqual(1, len(out))
+        self.assertListEqual(["167.128", "169.128"], out[0].variables())
+        # Ensure the temporary listing file has been cleaned up
+        self.assertFalse(pathlib.Path(targets[0]).exists())
+
+        # Ensure the temporary listing file is cleaned up on failure too
+        with unittest.mock.patch.object(
+            testBasicClient.server, "execute", side_effect=_writeNothing,
+        ):
+            out = testBasicClient.listRawFilesForInitTime(
+                it=dt.datetime(2020, 1, 1, tzinfo=dt.UTC),
+            )
+
+        self.assertListEqual([], out)
+        self.assertFalse(pathlib.Path(targets[1]).exists())
+
     def test_mapCachedRaw(self) -> None:
         testFilePath: pathlib.Path = pathlib.Path(__file__).parent / "test_2params.grib"
 
@@ -85,13 +120,12 @@ class TestECMWFMARSClient(unittest.TestCase):
             params=testDefaultClient.desired_params,
         )
 
-        out.replace(" ", "")
-        lines = out.split("\n")
+        lines = out.splitlines()
         self.assertEqual(lines[0], "list,")
 
         d: dict = {}
         for line in lines[1:]:
-            key, value = line.split("=")
+            key, value = line.split("=", 1)
             d[key.strip()] = value.strip().replace(",", "")
 
         self.assertEqual(d["param"], "/".join(PARAMETER_ECMWFCODE_MAP.keys()))
@@ -112,13 +146,12 @@ class TestECMWFMARSClient(unittest.TestCase):
             params=testBasicClient.desired_params,
         )
 
-        out.replace(" ", "")
-        lines = out.split("\n")
+        lines = out.splitlines()
         self.assertEqual(lines[0], "retrieve,")
 
         d2: dict = {}
         for line in lines[1:]:
-            key, value = line.split("=")
+            key, value = line.split("=", 1)
             d2[key.strip()] = value.strip().replace(",", "")
 
         self.assertEqual(d2["param"], "167.128/169.128")
@@ -138,7 +171,7 @@ class TestParseAvailableParams(unittest.TestCase):
                 "167.128",
                 "169.128",
             ],
-            sorted(out),
+            out,
         )
     def test_parsesParamsCorrectly(self) -> None:
         testFilePath: pathlib.Path = pathlib.Path(__file__).parent / "test_list_response.txt"
@@ -165,5 +198,17 @@ class TestParseAvailableParams(unittest.TestCase):
                 "47.128",
                 "57.128",
             ],
-            sorted(out),
+            out,
+        )
+
+    def test_parsesFileLinesCorrectly(self) -> None:
+        testFilePath: pathlib.Path = pathlib.Path(__file__).parent / "test_list_response.txt"
+
+        with testFilePath.open() as f:
+            out = _parseAvaliableParams(fileData=f)
+
+        self.assertListEqual(
+            _parseAvaliableParams(fileData=testFilePath.read_text()),
+            out,
         )
+        self.assertEqual(15, len(out))
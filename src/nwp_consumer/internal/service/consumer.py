@@ -122,7 +122,7 @@ class NWPConsumerService:
         bag: dask.bag.Bag = dask.bag.from_sequence(cachedPaths)
         cachedZarrs = (
             bag.map(lambda tfp: self.fetcher.mapCachedRaw(p=tfp))
-            .fold(lambda ds1, ds2: xr.merge([ds1, ds2], combine_attrs="drop_conflicts"))
+            .fold(lambda ds1, ds2: _mergeDatasets([ds1, ds2]))
             .compute()
         )
         datasets = dask.bag.from_sequence([cachedZarrs])
@@ -299,9 +299,10 @@ class NWPConsumerService:
             return []
 
         if self.rename_vars:
-            for var in ds.data_vars:
-                if var in self.fetcher.parameterConformMap():
-                    ds = ds.rename({var: self.fetcher.parameterConformMap()[var].value})
+            conformMap: dict[str, internal.OCFParameter] = self.fetcher.parameterConformMap()
+            ds = ds.rename(
+                {var: conformMap[var].value for var in ds.data_vars if var in conformMap},
+            )
 
         if self.variable_dim:
             ds = (
@@ -413,7 +414,15 @@ def _dataQualityFilter(ds: xr.Dataset) -> bool:
 def _mergeDatasets(datasets: list[xr.Dataset]) -> xr.Dataset:
     """Merge a list of datasets into a single dataset."""
     try:
-        ds: xr.Dataset = xr.merge(objects=datasets, combine_attrs="drop_conflicts")
+        # Set compat and join explicitly, as xarray's defaults for both are changing
+        # * compat="override" would keep only the first dataset's copy of a variable,
+        #   dropping the steps held in the others
+        ds: xr.Dataset = xr.merge(
+            objects=datasets,
+            compat="no_conflicts",
+            join="outer",
+            combine_attrs="drop_conflicts",
+        )
     except (xr.MergeError, ValueError, Exception) as e:
         log.warn(
             event="Merging datasets failed, trying to insert zeros for missing variables",
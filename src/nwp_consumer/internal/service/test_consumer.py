@@ -189,3 +189,34 @@ class TestMergeDatasets(unittest.TestCase):
         # Merge the datasets
         merged = _mergeDatasets(datasets)
 
+
+    def test_mergeSameDataVarAcrossSteps(self) -> None:
+        """Test merging datasets holding the same variable at different steps.
+
+        Fetchers such as NOAA and ICON map one file per step, so the
+        merge must combine the steps rather than keep only the first.
+        """
+        datasets = [
+            xr.Dataset(
+                data_vars={
+                    "t2m": (
+                        ("init_time", "step", "latitude", "longitude"),
+                        np.full((1, 1, 2, 2), float(step + 1)),
+                    ),
+                },
+                coords={
+                    "init_time": [np.datetime64("2021-01-01T00:00:00")],
+                    "step": [step],
+                    "latitude": range(2),
+                    "longitude": range(2),
+                },
+            )
+            for step in [0, 1]
+        ]
+
+        merged = _mergeDatasets(datasets)
+
+        self.assertEqual(2, merged.sizes["step"])
+        self.assertFalse(merged["t2m"].isnull().any())
+        self.assertTrue((merged["t2m"].sel(step=0) == 1).all())
+        self.assertTrue((merged["t2m"].sel(step=1) == 2).all())